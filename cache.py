@@ -0,0 +1,177 @@
+import os
+import sys
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from pymongo import ReturnDocument
+
+# 워커 간 공유 상태 저장소
+# - memory: 프로세스 내부 dict (로컬 개발/테스트용, 워커끼리 공유 안 됨)
+# - mongo : MongoDB 컬렉션 + TTL 인덱스 (여러 워커/서버가 같은 상태를 봄)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_COLLECTION = "cache_entries"
+
+# 버전 값을 로컬에서 재사용하는 시간(초). 부스 수정이 다른 워커에 반영되기까지 최대 이만큼 걸림
+VERSION_CHECK_INTERVAL = float(os.getenv("CACHE_VERSION_CHECK_INTERVAL", "2"))
+
+# 로컬에 기억해 둘 버전 수 (없는 부스 UUID로 계속 찔러도 메모리가 늘지 않도록 LRU로 제한)
+VERSION_MEMO_MAX = 4096
+
+
+class MemoryCache:
+    """프로세스 내부 dict 기반 백엔드"""
+
+    # 만료된 항목을 정리하는 주기(초) - get으로 다시 읽히지 않는 키도 쌓이지 않도록
+    SWEEP_INTERVAL = 60
+
+    def __init__(self):
+        self._data: dict[str, tuple[object, float | None]] = {}
+        self._last_sweep = time.time()
+
+    async def get(self, key: str, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    async def set(self, key: str, value, ttl: float | None = None):
+        now = time.time()
+        if now - self._last_sweep >= self.SWEEP_INTERVAL:
+            self._sweep(now)
+        expires_at = now + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+
+    def _sweep(self, now: float):
+        expired = [k for k, (_, expires_at) in self._data.items() if expires_at is not None and expires_at <= now]
+        for k in expired:
+            del self._data[k]
+        self._last_sweep = now
+
+    async def delete(self, key: str):
+        self._data.pop(key, None)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        value = await self.get(key, 0) + amount
+        self._data[key] = (value, None)
+        return value
+
+    async def clear(self):
+        self._data.clear()
+
+
+class MongoCache:
+    """MongoDB 컬렉션 기반 백엔드 (expires_at TTL 인덱스로 만료 문서 자동 삭제)"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def setup(self):
+        # expireAfterSeconds=0 : expires_at 시각이 지나면 삭제 (필드가 없는 문서는 영구 보관)
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get(self, key: str, default=None):
+        doc = await self.collection.find_one({"_id": key})
+        if doc is None:
+            return default
+        # TTL 모니터는 약 60초 주기로 돌기 때문에 만료 여부를 직접 한 번 더 확인
+        expires_at = doc.get("expires_at")
+        if expires_at is not None and expires_at.replace(tzinfo=timezone.utc) <= datetime.now(timezone.utc):
+            return default
+        return doc.get("value", default)
+
+    async def set(self, key: str, value, ttl: float | None = None):
+        doc = {"value": value}
+        if ttl:
+            doc["expires_at"] = datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        await self.collection.replace_one({"_id": key}, doc, upsert=True)
+
+    async def delete(self, key: str):
+        await self.collection.delete_one({"_id": key})
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            {"$inc": {"value": amount}, "$unset": {"expires_at": ""}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["value"]
+
+    async def clear(self):
+        await self.collection.delete_many({})
+
+
+_backend = MemoryCache()
+
+# { 이름: (버전, 확인한 시각) } - 공유 저장소 조회를 VERSION_CHECK_INTERVAL 동안 생략
+_version_memo: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+
+def _remember_version(name: str, version: int, checked_at: float):
+    _version_memo[name] = (version, checked_at)
+    _version_memo.move_to_end(name)
+    while len(_version_memo) > VERSION_MEMO_MAX:
+        _version_memo.popitem(last=False)
+
+
+def _configured_workers() -> int:
+    """uvicorn/gunicorn 워커 수 (WEB_CONCURRENCY 또는 --workers/-w 옵션, 모르면 1)"""
+    workers = os.getenv("WEB_CONCURRENCY", "1")
+    args = sys.argv[1:]  # spawn된 워커도 부모의 argv를 그대로 받음
+    for i, arg in enumerate(args):
+        if arg in ("--workers", "-w") and i + 1 < len(args):
+            workers = args[i + 1]
+        elif arg.startswith("--workers="):
+            workers = arg.split("=", 1)[1]
+    try:
+        return int(workers)
+    except ValueError:
+        return 1
+
+
+async def init_cache(database):
+    """database.init_db()에서 호출. CACHE_BACKEND=mongo면 MongoDB 백엔드로 교체"""
+    global _backend
+    if CACHE_BACKEND == "mongo":
+        _backend = MongoCache(database[CACHE_COLLECTION])
+        await _backend.setup()
+    else:
+        _backend = MemoryCache()
+        workers = _configured_workers()
+        if workers > 1:
+            # 부스 수정이 다른 워커에 전달되지 않아, 페이지 캐시 만료(PAGE_CACHE_MAX_AGE) 전까지 옛 내용이 보임
+            print(f"⚠️ 워커 {workers}개에서 CACHE_BACKEND=memory 사용 중: 부스 수정이 다른 워커에 바로 반영되지 않습니다. "
+                  "CACHE_BACKEND=mongo 를 권장합니다.")
+    _version_memo.clear()
+
+
+def get_cache():
+    return _backend
+
+
+async def get_version(name: str) -> int:
+    """
+    name에 해당하는 버전 번호를 돌려줍니다.
+    로컬 캐시를 버릴지 판단할 때 사용 (버전이 바뀌면 다른 워커에서 수정이 일어난 것)
+    """
+    memo = _version_memo.get(name)
+    now = time.monotonic()
+    if memo and now - memo[1] < VERSION_CHECK_INTERVAL:
+        _version_memo.move_to_end(name)
+        return memo[0]
+
+    version = await _backend.get(f"version:{name}", 0)
+    _remember_version(name, version, now)
+    return version
+
+
+async def bump_version(name: str) -> int:
+    """name의 버전을 올려서 모든 워커의 관련 로컬 캐시를 무효화합니다."""
+    version = await _backend.incr(f"version:{name}")
+    _remember_version(name, version, time.monotonic())
+    return version
@@ -0,0 +1,49 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+from static_assets import STATIC_URL
+
+# 이미 압축된 형식 - 다시 gzip 해도 크기는 그대로고 CPU만 씀
+COMPRESSED_MEDIA_TYPES = (
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument.",  # xlsx 등 (내부가 ZIP)
+)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    async def send_with_compression(self, message):
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            compressed = headers.get("content-type", "").startswith(COMPRESSED_MEDIA_TYPES)
+            # 부분 응답(206)을 압축하면 Content-Range와 본문 길이가 어긋남
+            if compressed or message["status"] == 206:
+                await super().send_with_compression(message)
+                self.content_type_is_excluded = True
+                return
+        await super().send_with_compression(message)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware와 같지만
+    - /booth/static 아래는 CachedStaticFiles가 미리 압축한 .gz로 처리하므로 건너뜀
+    - 이미지/xlsx/zip/pdf처럼 이미 압축된 응답과 206 부분 응답은 압축하지 않음
+    """
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(f"{STATIC_URL}/"):
+            await self.app(scope, receive, send)
+            return
+
+        if "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await super().__call__(scope, receive, send)
+            return
+
+        responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        await responder(scope, receive, send)
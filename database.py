@@ -3,6 +3,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 from dotenv import load_dotenv
 from models import Booth, Survey  # 우리가 만든 모델 불러오기
+from cache import init_cache
 
 # .env 파일 로드
 load_dotenv()
@@ -21,4 +22,7 @@ async def init_db():
 
     # 4. Beanie 초기화 (모델 등록)
     # document_models에 등록된 클래스들은 자동으로 MongoDB 컬렉션과 매핑됨
-    await init_beanie(database=database, document_models=[Booth, Survey])
\ No newline at end of file
+    await init_beanie(database=database, document_models=[Booth, Survey])
+
+    # 5. 워커 간 공유 캐시 초기화 (CACHE_BACKEND=mongo면 같은 DB에 cache_entries 컬렉션 사용)
+    await init_cache(database)
\ No newline at end of file
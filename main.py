@@ -1,13 +1,45 @@
+import time
+_started_at = time.perf_counter()  # 기동 시간 측정 시작 (import 비용 포함)
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import sys
 
 from database import init_db
-from routers import user, admin, analysis
+from static_assets import CachedStaticFiles, precompress_static_files
+from compression import SelectiveGZipMiddleware
+from profiling import ProfilingMiddleware
+from routers import user, admin
+
+# 투표 전용 레플리카는 ENABLE_ANALYSIS=0 으로 띄우면 분석 라우터 자체를 등록하지 않음
+ENABLE_ANALYSIS = os.getenv("ENABLE_ANALYSIS", "1") == "1"
+
+# 분석 전용 워커라면 WARM_ANALYSIS_IMPORTS=1 로 기동 직후 pandas 등을 미리 로드할 수 있음
+# (기본값은 끔: 투표 워커의 메모리가 늘고, import가 GIL을 잡아 투표 요청 처리가 느려짐)
+WARM_ANALYSIS_IMPORTS = os.getenv("WARM_ANALYSIS_IMPORTS", "0") == "1"
+
+if ENABLE_ANALYSIS:
+    from routers import analysis
+
+
+def report_startup(started_at: float):
+    """기동 소요 시간과 메모리(RSS), 무거운 라이브러리 로드 여부를 출력"""
+    elapsed = time.perf_counter() - started_at
+    try:
+        import resource  # 리눅스/맥 전용
+        rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            rss_kb //= 1024  # 맥은 바이트 단위
+        rss = f"{rss_kb / 1024:.1f}MB"
+    except ImportError:
+        rss = "unknown"
+
+    heavy = [name for name in ("pandas", "matplotlib", "openpyxl") if name in sys.modules]
+    print(f"Startup: {elapsed:.2f}s, max RSS {rss}, heavy modules loaded: {heavy or 'none'}")
+
 
 # --- [Lifespan: 앱 생명주기 관리] ---
 @asynccontextmanager
@@ -22,8 +54,17 @@ async def lifespan(app: FastAPI):
         os.makedirs(qr_path)
         print(f"Created directory: {qr_path}")
 
+    # 3. 정적 파일 .gz 버전 미리 생성 (모바일 전송량 절감)
+    precompress_static_files()
+
+    report_startup(_started_at)
+
+    # 4. 분석용 무거운 모듈은 보통 첫 분석/내보내기 요청 때 로드 (옵션을 켠 경우에만 미리 로드)
+    if ENABLE_ANALYSIS and WARM_ANALYSIS_IMPORTS:
+        await analysis.load_analysis_modules()
+
     yield
-    # 3. 종료 시: (필요하면 연결 종료 로직 추가)
+    # 5. 종료 시: (필요하면 연결 종료 로직 추가)
     print("App Shutdown")
 
 origins = [
@@ -47,16 +88,23 @@ app.add_middleware(
     allow_headers=["*"],        # 허용할 HTTP 헤더 (Content-Type, Authorization 등 전체)
 )
 
+# HTML/JSON 응답 gzip 압축 (500바이트 미만은 압축 이득이 없어 그대로 전송)
+# 정적 파일과 이미 압축된 형식(PNG, xlsx/zip/pdf)은 제외
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=500, compresslevel=6)
+
+# 단계별 소요 시간(Server-Timing) + 요청 단위 cProfile (관리자 전용, 선택적)
+app.add_middleware(ProfilingMiddleware)
+
 app.include_router(user.router)
 app.include_router(admin.router)
-app.include_router(analysis.router)
+if ENABLE_ANALYSIS:
+    app.include_router(analysis.router)
 
-# --- [정적 파일 및 템플릿 설정] ---
+# --- [정적 파일 설정] ---
+# (템플릿 환경은 templating.py에서 공용으로 관리)
 # /booth/static 경로로 들어오는 요청은 static 폴더의 파일을 보여줌
-app.mount("/booth/static", StaticFiles(directory="static"), name="static")
-
-# templates 폴더를 Jinja2 템플릿 경로로 지정
-templates = Jinja2Templates(directory="templates")
+# (미리 압축된 .gz 우선 전송, ?v=<해시> URL은 immutable 캐시)
+app.mount("/booth/static", CachedStaticFiles(directory="static"), name="static")
 
 
 @app.get("/")
@@ -4,6 +4,7 @@ from typing import Annotated
 from datetime import datetime
 from beanie import Document, Indexed, PydanticObjectId
 from pydantic import Field
+from pymongo import IndexModel, ASCENDING
 
 
 # 1. 부스 정보 모델
@@ -36,7 +37,7 @@ class Booth(Document):
 # 2. 설문 응답 모델
 class Survey(Document):
     id: UUID = Field(default_factory=uuid4)
-    booth_id: Annotated[UUID, Indexed()]
+    booth_id: UUID  # 인덱스는 아래 (booth_id, created_at) 복합 인덱스가 대신함
     score: int
 
     # [방어 1단계] 쿠키 ID (기존 voter_id 유지)
@@ -48,4 +49,9 @@ class Survey(Document):
     created_at: datetime = Field(default_factory=datetime.now)
 
     class Settings:
-        name = "surveys"
\ No newline at end of file
+        name = "surveys"
+        # 중복 투표 검사(booth_id)와 부스별 시간대 통계는 복합 인덱스, 전체 시간대 통계는 created_at 인덱스
+        indexes = [
+            IndexModel([("booth_id", ASCENDING), ("created_at", ASCENDING)]),
+            IndexModel([("created_at", ASCENDING)]),
+        ]
\ No newline at end of file
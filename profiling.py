@@ -0,0 +1,208 @@
+import cProfile
+import io
+import os
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+
+from cache import get_cache, VERSION_CHECK_INTERVAL
+
+# 프로파일 결과(.prof) 저장 폴더
+PROFILE_DIR = "profiles"
+
+# 관리자 토글이 켜져 있을 때 자동으로 프로파일링할 경로 (느린 요청들)
+PROFILED_PREFIXES = ("/analysis/generate-report", "/analysis/calc-average", "/booth/admin/create_booth")
+
+# 이 헤더를 붙인 관리자 요청은 토글과 상관없이 프로파일링
+PROFILE_HEADER = "x-profile"
+
+PROFILE_TOGGLE_KEY = "profiling:enabled"
+PROFILE_NAME_PATTERN = re.compile(r"^[\w\-.]+\.prof$")
+
+# 보관할 .prof 파일 수 (넘으면 오래된 것부터 삭제)
+MAX_PROFILES = 50
+
+# 요청별 단계 소요 시간 {단계명: 누적 ms} - 관리자/프로파일링 요청에만 미들웨어가 새 dict를 넣어줌
+_stage_timings: ContextVar[dict | None] = ContextVar("stage_timings", default=None)
+
+# 현재 요청이 cProfile로 측정 중인지
+_request_profiled: ContextVar[bool] = ContextVar("request_profiled", default=False)
+
+# cProfile은 동시에 하나만 켤 수 있으므로, 이미 프로파일링 중이면 다음 요청은 건너뜀
+_profiling_active = False
+
+# 토글 값을 로컬에서 재사용 (매 요청마다 공유 캐시를 조회하지 않도록)
+_toggle_memo: tuple[bool, float] | None = None
+
+
+@contextmanager
+def stage(name: str):
+    """
+    with stage("parse"): ... 처럼 감싼 구간의 소요 시간을 기록합니다.
+    같은 이름이 여러 번 나오면(학생별 차트 등) 합산되고, 응답의 Server-Timing 헤더로 나갑니다.
+    StreamingResponse 본문을 만들면서 기록된 단계는 헤더가 이미 나간 뒤라 포함되지 않습니다.
+    """
+    timings = _stage_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+async def is_profiling_enabled() -> bool:
+    global _toggle_memo
+    now = time.monotonic()
+    if _toggle_memo and now - _toggle_memo[1] < VERSION_CHECK_INTERVAL:
+        return _toggle_memo[0]
+
+    enabled = bool(await get_cache().get(PROFILE_TOGGLE_KEY, False))
+    _toggle_memo = (enabled, now)
+    return enabled
+
+
+async def set_profiling_enabled(enabled: bool):
+    """관리자 토글 (공유 캐시에 저장하므로 모든 워커에 적용)"""
+    global _toggle_memo
+    await get_cache().set(PROFILE_TOGGLE_KEY, enabled)
+    _toggle_memo = (enabled, time.monotonic())
+
+
+def _format_server_timing(timings: dict) -> str:
+    return ", ".join(f"{name};dur={ms:.1f}" for name, ms in timings.items())
+
+
+def _profile_filename(request: Request) -> str:
+    path = re.sub(r"[^\w\-]+", "_", request.url.path.strip("/")) or "root"
+    return f"{datetime.now():%Y%m%d_%H%M%S_%f}_{request.method}_{path}.prof"
+
+
+def is_request_profiled() -> bool:
+    """
+    현재 요청이 cProfile로 측정 중이면 True.
+    스트리밍 응답은 헤더를 보낸 뒤 스레드풀에서 본문을 만들기 때문에 측정되지 않으므로,
+    이 경우 호출하는 쪽에서 본문을 미리 만들어 두어야 합니다.
+    """
+    return _request_profiled.get()
+
+
+async def _should_profile(request: Request, is_admin: bool) -> bool:
+    if is_admin and request.headers.get(PROFILE_HEADER) == "1":
+        return True
+    return request.url.path.startswith(PROFILED_PREFIXES) and await is_profiling_enabled()
+
+
+def _prune_profiles():
+    names = sorted(name for name in os.listdir(PROFILE_DIR) if PROFILE_NAME_PATTERN.match(name))
+    for name in names[:-MAX_PROFILES]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, name))
+        except OSError:
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    관리자 요청에만 단계별 소요 시간(Server-Timing)과 X-Profile-Id를 붙이고,
+    X-Profile: 1 헤더(관리자) 또는 관리자 토글이 켜진 경우 cProfile 결과를 저장합니다.
+    (같은 이벤트 루프에서 동시에 처리된 다른 요청의 코드도 함께 잡힐 수 있음)
+    순수 ASGI 미들웨어라서, 대상이 아닌 요청(QR 랜딩 등)은 쿠키 확인 외에 추가 비용이 없습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _profiling_active
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        from routers.admin import check_admin_auth  # 순환 import 방지
+
+        request = Request(scope)
+        is_admin = check_admin_auth(request)
+        profiler = None
+
+        # await 이후에 다시 확인하고 곧바로 표시해야 두 요청이 동시에 켜지 않음
+        if await _should_profile(request, is_admin) and not _profiling_active:
+            _profiling_active = True
+            profiler = cProfile.Profile()
+
+        if not is_admin and profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        timings = {}
+        timings_token = _stage_timings.set(timings)
+        profiled_token = _request_profiled.set(profiler is not None)
+        filename = _profile_filename(request) if profiler else None
+        started = time.perf_counter()
+
+        async def send_with_timing(message):
+            # 토글로 프로파일링된 일반 사용자 요청에는 내부 정보(소요 시간, 파일명)를 노출하지 않음
+            if message["type"] == "http.response.start" and is_admin:
+                timings["total"] = (time.perf_counter() - started) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", _format_server_timing(timings))
+                if filename:
+                    headers.append("X-Profile-Id", filename)
+            await send(message)
+
+        try:
+            if profiler:
+                profiler.enable()
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if profiler:
+                profiler.disable()
+                _profiling_active = False
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                profiler.dump_stats(os.path.join(PROFILE_DIR, filename))
+                _prune_profiles()
+            _request_profiled.reset(profiled_token)
+            _stage_timings.reset(timings_token)
+
+
+def list_profiles() -> list[dict]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+
+    profiles = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if not PROFILE_NAME_PATTERN.match(name):
+            continue
+        stat = os.stat(os.path.join(PROFILE_DIR, name))
+        profiles.append({
+            "name": name,
+            "size": stat.st_size,
+            "created_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+        })
+    return profiles
+
+
+def get_profile_path(name: str) -> str | None:
+    """파일명 검증 후 경로 반환 (../ 등 경로 조작 차단)"""
+    if not PROFILE_NAME_PATTERN.match(name):
+        return None
+    path = os.path.join(PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def profile_summary(path: str, limit: int = 40) -> str:
+    """누적 시간 기준 상위 함수 목록 (pstats 텍스트)"""
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
@@ -1,18 +1,22 @@
 from fastapi import APIRouter, Request, Form, Response
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse, StreamingResponse, HTMLResponse  # HTMLResponse 추가
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, StreamingResponse, HTMLResponse, JSONResponse, FileResponse, PlainTextResponse  # HTMLResponse 추가
 from models import Booth, Survey
-import pandas as pd
 from io import BytesIO
 from services.qr_service import generate_booth_qr
+from services.stats_service import get_vote_stats, default_range, to_local_naive, ALLOWED_BUCKETS, ALLOWED_GROUPS
+from templating import templates, invalidate_booth_pages
+from profiling import is_profiling_enabled, set_profiling_enabled, list_profiles, get_profile_path, profile_summary
 from uuid import UUID
+from datetime import datetime
+from typing import Optional
 from dotenv import load_dotenv
 import os
+import importlib
 
 load_dotenv()
 
 router = APIRouter(prefix="/booth", tags=["booth"])
-templates = Jinja2Templates(directory="templates")
 
 
 ADMIN_USERNAME = os.getenv("ADMIN_USERNAME")
@@ -105,6 +109,7 @@ async def delete_booth(request: Request, booth_uuid: str):
     booth = await Booth.find_one(Booth.booth_id == UUID(booth_uuid))
     if booth:
         await booth.delete()
+        await invalidate_booth_pages(booth.booth_id)
 
     return RedirectResponse(url="/booth/admin", status_code=303)
 
@@ -125,6 +130,7 @@ async def update_booth(
         booth.description = description
         booth.location = location
         await booth.save()  # DB에 저장
+        await invalidate_booth_pages(booth.booth_id)  # 캐시된 랜딩 페이지 갱신
 
     return RedirectResponse(url="/booth/admin", status_code=303)
 
@@ -133,6 +139,9 @@ async def update_booth(
 async def export_excel(request: Request):
     if not check_admin_auth(request): return RedirectResponse(url="/booth/login", status_code=302)
 
+    # 엑셀 내보내기에서만 쓰므로 필요할 때 로드 (import는 스레드에서 처리해 이벤트 루프를 막지 않음)
+    pd = await run_in_threadpool(importlib.import_module, "pandas")
+
     booths = await Booth.find_all().to_list()
 
     data = []
@@ -163,6 +172,92 @@ async def export_excel(request: Request):
                              media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
 
 
+@router.get("/admin/analytics")
+async def vote_analytics(
+        request: Request,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bucket: int = 60,
+        group: str = "booth",
+        booth_id: Optional[UUID] = None
+):
+    """
+    시간대별 투표 통계 (예: /booth/admin/analytics?start=2025-05-21T14:00&end=2025-05-21T15:00&bucket=15)
+    group=booth 이면 부스별, group=global 이면 전체 합계, booth_id를 주면 해당 부스만
+    """
+    if not check_admin_auth(request):
+        return JSONResponse(content={"status": "error", "msg": "로그인이 필요합니다."}, status_code=401)
+
+    if group not in ALLOWED_GROUPS:
+        return JSONResponse(content={"status": "error", "msg": f"group은 {ALLOWED_GROUPS} 중 하나여야 합니다."}, status_code=400)
+    if bucket not in ALLOWED_BUCKETS:
+        return JSONResponse(content={"status": "error", "msg": f"bucket은 {ALLOWED_BUCKETS} 중 하나여야 합니다."}, status_code=400)
+
+    # 타임존이 붙은 값도 DB에 저장된 형태(로컬 시각, naive)로 맞춘 뒤 기본값과 섞음
+    start = to_local_naive(start) if start else None
+    end = to_local_naive(end) if end else None
+    if start is None or end is None:
+        default_start, default_end = default_range(bucket)
+        start = start or default_start
+        end = end or default_end
+
+    try:
+        stats = await get_vote_stats(start, end, bucket_minutes=bucket, per_booth=(group == "booth"), booth_id=booth_id)
+    except ValueError as e:
+        return JSONResponse(content={"status": "error", "msg": str(e)}, status_code=400)
+
+    return JSONResponse(content={
+        "status": "success",
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "bucket": bucket,
+        "group": group,
+        "booth_id": str(booth_id) if booth_id else None,
+        "data": stats,
+    })
+
+
+@router.get("/admin/profiling")
+async def profiling_status(request: Request):
+    """프로파일링 토글 상태와 저장된 프로파일 목록"""
+    if not check_admin_auth(request):
+        return JSONResponse(content={"status": "error", "msg": "로그인이 필요합니다."}, status_code=401)
+
+    return JSONResponse(content={
+        "status": "success",
+        "enabled": await is_profiling_enabled(),
+        "profiles": list_profiles(),
+    })
+
+
+@router.post("/admin/profiling")
+async def toggle_profiling(request: Request, enabled: bool = Form(...)):
+    """켜두면 리포트 생성/평균 계산/부스(QR) 생성 요청이 자동으로 프로파일링됨"""
+    if not check_admin_auth(request):
+        return JSONResponse(content={"status": "error", "msg": "로그인이 필요합니다."}, status_code=401)
+
+    await set_profiling_enabled(enabled)
+    return JSONResponse(content={"status": "success", "enabled": enabled})
+
+
+@router.get("/admin/profiling/{name}")
+async def download_profile(request: Request, name: str, view: str = "raw"):
+    """
+    저장된 .prof 파일 다운로드 (snakeviz, pstats 등으로 열기)
+    view=text 이면 누적 시간 상위 함수 목록을 텍스트로 반환
+    """
+    if not check_admin_auth(request):
+        return JSONResponse(content={"status": "error", "msg": "로그인이 필요합니다."}, status_code=401)
+
+    path = get_profile_path(name)
+    if not path:
+        return JSONResponse(content={"status": "error", "msg": "프로파일을 찾을 수 없습니다."}, status_code=404)
+
+    if view == "text":
+        return PlainTextResponse(profile_summary(path))
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
+
+
 @router.post("/admin/reset_all")
 async def reset_all_data(request: Request):
     if not check_admin_auth(request): return RedirectResponse(url="/booth/login", status_code=302)
@@ -170,5 +265,6 @@ async def reset_all_data(request: Request):
     await Survey.delete_all()
 
     await Booth.delete_all()
+    await invalidate_booth_pages()
 
     return RedirectResponse(url="/booth/admin", status_code=303)
@@ -1,13 +1,37 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
 from fastapi.responses import StreamingResponse, HTMLResponse
-from services.analysis_service import calculate_trimmed_mean_logic, generate_report_logic, df_to_excel, get_merged_report_df
-from fastapi.templating import Jinja2Templates
-import pandas as pd
+from starlette.concurrency import run_in_threadpool
+import importlib
 import io
+from typing import Optional
+from templating import templates
+from profiling import stage, is_request_profiled
 
-templates = Jinja2Templates(directory="templates")
 router = APIRouter(prefix="/analysis", tags=["Analysis"])
 
+# pandas / matplotlib / openpyxl은 무거워서 (투표 전용 워커의 기동 시간·메모리 절약)
+# 분석 기능이 처음 호출될 때 import 합니다.
+ANALYSIS_MODULES = ("pandas", "services.analysis_service", "services.trimmed_mean_service")
+
+
+def warm_analysis_imports():
+    """분석용 무거운 모듈을 import (이미 로드돼 있으면 바로 끝남)"""
+    for name in ANALYSIS_MODULES:
+        importlib.import_module(name)
+
+
+async def load_analysis_modules():
+    # 아직 로드 전이면 import를 스레드에서 처리해서 이벤트 루프(=투표 요청)를 막지 않음
+    await run_in_threadpool(warm_analysis_imports)
+
+
+async def run_report(func, *args):
+    # 차트 렌더링도 스레드에서 실행해서 이벤트 루프를 막지 않음
+    # (cProfile은 켠 스레드만 측정하므로, 프로파일링 중인 요청만 그대로 실행)
+    if is_request_profiled():
+        return func(*args)
+    return await run_in_threadpool(func, *args)
+
 
 @router.get("/", response_class=HTMLResponse)
 async def analysis_page(request: Request):
@@ -17,16 +41,26 @@ async def analysis_page(request: Request):
 
 # 1. [미리보기용] JSON 데이터 반환
 @router.post("/calc-average/preview")
-async def calculate_average_preview(file: UploadFile = File(...)):
+async def calculate_average_preview(file: UploadFile = File(...), dataset_id: Optional[str] = Form(None)):
     if not file.filename.endswith(('.xlsx', '.xls')):
         raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다.")
 
     try:
+        await load_analysis_modules()
+        import pandas as pd
+        from services.analysis_service import calculate_trimmed_mean_logic
+        from services.trimmed_mean_service import calculate_trimmed_mean_incremental
+
         contents = await file.read()
-        df = pd.read_excel(io.BytesIO(contents))
+        with stage("parse"):
+            df = pd.read_excel(io.BytesIO(contents))
 
-        # 계산 로직 실행
-        result_df = calculate_trimmed_mean_logic(df)
+        # 계산 로직 실행 (dataset_id가 있으면 이전 업로드 대비 바뀐 그룹만 재계산)
+        with stage("compute"):
+            if dataset_id:
+                result_df, _ = calculate_trimmed_mean_incremental(df, dataset_id)
+            else:
+                result_df = calculate_trimmed_mean_logic(df)
 
         # DataFrame -> Dictionary 변환 (JSON 응답용)
         # orient='split'은 index, columns, data를 분리해서 줍니다.
@@ -43,6 +77,10 @@ async def calculate_average_download(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="엑셀 파일만 업로드 가능합니다.")
 
     try:
+        await load_analysis_modules()
+        import pandas as pd
+        from services.analysis_service import calculate_trimmed_mean_logic, df_to_excel
+
         contents = await file.read()
         df = pd.read_excel(io.BytesIO(contents))
 
@@ -67,6 +105,9 @@ async def generate_report_preview(
         others_file: UploadFile = File(...)
 ):
     try:
+        await load_analysis_modules()
+        from services.analysis_service import get_merged_report_df
+
         # 파일 읽기
         my_content = await my_file.read()
         others_content = await others_file.read()
@@ -81,23 +122,50 @@ async def generate_report_preview(
         raise HTTPException(status_code=500, detail=f"데이터 병합 중 오류: {str(e)}")
 
 
-# 2. [다운로드] 차트 포함 엑셀 파일 생성 (기존 로직)
+# 리포트 출력 형식별 (MIME 타입, 파일명)
+REPORT_FORMATS = {
+    "xlsx": ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', "final_report.xlsx"),
+    "zip-png": ('application/zip', "final_report_png.zip"),
+    "zip-svg": ('application/zip', "final_report_svg.zip"),
+    "pdf": ('application/pdf', "final_report.pdf"),
+}
+
+
+# 2. [다운로드] 차트 포함 리포트 생성 (xlsx / 차트 ZIP / PDF)
 @router.post("/generate-report/download")
 async def generate_report_download(
         my_file: UploadFile = File(...),
-        others_file: UploadFile = File(...)
+        others_file: UploadFile = File(...),
+        output_format: str = Form("xlsx")
 ):
+    if output_format not in REPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {output_format}")
+
     try:
+        await load_analysis_modules()
+        from services.analysis_service import generate_report_logic, generate_report_zip, generate_report_pdf, iter_file
+
         my_content = await my_file.read()
         others_content = await others_file.read()
 
-        # 기존의 엑셀+차트 생성 로직 실행 (시간이 좀 걸림)
-        output_excel = generate_report_logic(io.BytesIO(my_content), io.BytesIO(others_content))
-
+        if output_format == "xlsx":
+            # 기존의 엑셀+차트 생성 로직 실행 (시간이 좀 걸림)
+            body = iter_file(await run_report(generate_report_logic, io.BytesIO(my_content), io.BytesIO(others_content)))
+        elif output_format == "pdf":
+            body = iter_file(await run_report(generate_report_pdf, io.BytesIO(my_content), io.BytesIO(others_content)))
+        else:
+            # 차트가 하나 그려질 때마다 바로 전송
+            image_format = output_format.split("-")[1]
+            body = await run_report(generate_report_zip, io.BytesIO(my_content), io.BytesIO(others_content), image_format)
+            if is_request_profiled():
+                # 프로파일링 중이면 차트 렌더링까지 측정되도록 응답 전에 ZIP을 모두 만들어 둠
+                body = iter([b"".join(body)])
+
+        media_type, filename = REPORT_FORMATS[output_format]
         return StreamingResponse(
-            output_excel,
-            media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            headers={'Content-Disposition': 'attachment; filename="final_report.xlsx"'}
+            body,
+            media_type=media_type,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"리포트 생성 중 오류: {str(e)}")
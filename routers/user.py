@@ -1,14 +1,13 @@
 from fastapi import APIRouter, Request, Form
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import RedirectResponse, JSONResponse
 from models import Booth, Survey
 from uuid import UUID, uuid4
 from pydantic import BaseModel
 from pymongo.errors import DuplicateKeyError
 from beanie.operators import Or
+from templating import templates, cached_booth_page, render_booth_page
 
 router = APIRouter(prefix="/booth", tags=["booth"])
-templates = Jinja2Templates(directory="templates")
 
 
 class SurveyRequest(BaseModel):
@@ -26,14 +25,16 @@ async def success_page(request: Request):
 async def entry_page(request: Request, booth_id: str):
     # 부스가 진짜 있는지 확인}
     try:
+        # 이미 렌더링된 페이지가 있으면 DB 조회 없이 바로 응답
+        cached, version = await cached_booth_page(request, "select_type.html", booth_id)
+        if cached:
+            return cached
+
         booth = await Booth.find_one(Booth.booth_id == UUID(booth_id))
         if not booth:
             return templates.TemplateResponse("error.html", {"request": request, "msg": "유효하지 않은 부스입니다."})
 
-        return templates.TemplateResponse(
-            "select_type.html",
-            {"request": request, "booth_id": booth_id,"booth": booth}
-        )
+        return await render_booth_page(request, "select_type.html", booth_id, {"booth_id": booth_id}, booth, version)
     except ValueError:
         # UUID 형식이 아닌 이상한 문자열이 들어왔을 때의 예외 처리
         return templates.TemplateResponse("error.html", {"request": request, "msg": "잘못된 부스 ID 형식입니다."})
@@ -44,14 +45,18 @@ async def entry_page(request: Request, booth_id: str):
 async def get_survey_page(request: Request, booth_uuid: str):
     # 1. 부스가 진짜 있는지 확인 (선택 사항이지만 안전을 위해 권장)
     try:
+        cached, version = await cached_booth_page(request, "survey.html", booth_uuid)
+        if cached:
+            return cached
+
         booth = await Booth.find_one(Booth.booth_id == UUID(booth_uuid))
         if not booth:
             return templates.TemplateResponse("error.html", {"request": request, "msg": "존재하지 않는 부스입니다."})
     except:
         return templates.TemplateResponse("error.html", {"request": request, "msg": "잘못된 주소입니다."})
 
-    # 2. survey.html 화면을 보여줌
-    return templates.TemplateResponse("survey.html", {"request": request,"booth": booth})
+    # 2. survey.html 화면을 보여줌 (렌더링 결과는 부스별로 캐시됨)
+    return await render_booth_page(request, "survey.html", booth_uuid, {}, booth, version)
 
 
 @router.post("/survey/{booth_uuid}")
@@ -1,13 +1,23 @@
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use("Agg")  # 서버용 비대화형 백엔드 (GUI 백엔드 탐색 비용 제거)
+# 마이너스 기호 깨짐 방지 (전역 설정이므로 요청마다 바꾸지 않고 import 시 한 번만)
+matplotlib.rcParams['axes.unicode_minus'] = False
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_pdf import PdfPages
 from math import pi
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.drawing.image import Image as ExcelImage
 import matplotlib.font_manager as fm
 import io
 import os
 import tempfile
 import re
+import zipfile
+
+from profiling import stage
 
 # 폰트 경로 설정 (qr_service와 동일하게 맞춤)
 FONT_PATH = "static/fonts/malgunbd.ttf"
@@ -79,15 +89,12 @@ def get_merged_report_df(file_my, file_others) -> pd.DataFrame:
 
 
 # [기능 2] 차트 생성 및 리포트 로직
-def create_radar_chart_img(categories, my_view, others_view, name, student_id):
-    """Matplotlib 차트를 그려서 임시 파일 경로를 반환"""
+def draw_radar_chart(categories, my_view, others_view, name, student_id):
+    """Matplotlib 방사형 차트 Figure를 그려서 반환 (저장은 호출하는 쪽에서)"""
 
     # ★ 폰트 설정 로드
     font_prop = load_custom_font()
 
-    # 마이너스 기호 깨짐 방지
-    plt.rcParams['axes.unicode_minus'] = False
-
     num_vars = len(categories)
     angles = [n / float(num_vars) * 2 * pi for n in range(num_vars)]
     angles += angles[:1]
@@ -95,8 +102,9 @@ def create_radar_chart_img(categories, my_view, others_view, name, student_id):
     my_view_plot = my_view + my_view[:1]
     others_view_plot = others_view + others_view[:1]
 
-    # 객체 지향 방식 사용
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
+    # 객체 지향 방식 사용 (pyplot 전역 상태를 안 쓰므로 여러 스레드에서 동시에 그려도 안전)
+    fig = Figure(figsize=(6, 6))
+    ax = fig.add_subplot(polar=True)
 
     ax.set_theta_offset(pi / 2)
     ax.set_theta_direction(-1)
@@ -131,69 +139,127 @@ def create_radar_chart_img(categories, my_view, others_view, name, student_id):
     for i, val in enumerate(others_view_plot[:-1]):
         ax.text(angles[i], val + 0.3, str(val), color='red', ha='center', size=9, weight='bold')
 
-    # 임시 파일로 저장
-    fd, path = tempfile.mkstemp(suffix=".png")
-    plt.savefig(path, bbox_inches='tight', dpi=100)
-    plt.close(fig)
-    os.close(fd)
+    return fig
+
+
+def create_radar_chart_img(categories, my_view, others_view, name, student_id):
+    """Matplotlib 차트를 그려서 임시 파일 경로를 반환"""
+    with stage("render"):
+        fig = draw_radar_chart(categories, my_view, others_view, name, student_id)
+
+        # 임시 파일로 저장
+        fd, path = tempfile.mkstemp(suffix=".png")
+        fig.savefig(path, bbox_inches='tight', dpi=100)
+        os.close(fd)
 
     return path
 
 
-def generate_report_logic(file_my, file_others) -> io.BytesIO:
-    # 1. 데이터 읽기
-    df_my = pd.read_excel(file_my)
-    df_others = pd.read_excel(file_others)
+def create_radar_chart_bytes(categories, my_view, others_view, name, student_id, image_format="png") -> bytes:
+    """차트를 임시 파일 없이 바로 PNG/SVG 바이트로 반환"""
+    with stage("render"):
+        fig = draw_radar_chart(categories, my_view, others_view, name, student_id)
+        buf = io.BytesIO()
+        fig.savefig(buf, format=image_format, bbox_inches='tight', dpi=100)
+    return buf.getvalue()
+
+
+# 리포트 표 머리글 스타일 (모든 시트가 같은 스타일 객체를 공유)
+HEADER_FONT = Font(bold=True, color="FFFFFF")
+HEADER_FILL = PatternFill(start_color="005EB8", end_color="005EB8", fill_type="solid")
+HEADER_ALIGNMENT = Alignment(horizontal="center")
+
+# 차트 이미지 아래에 표가 시작되는 행 (6인치 차트 높이만큼 비워둠)
+REPORT_TABLE_START_ROW = 30
+
+# 완성된 엑셀 파일이 이 크기를 넘으면 메모리 대신 디스크 임시 파일에 씀
+SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
+
+def _header_row(ws, values):
+    """공용 스타일이 적용된 머리글 행 (write-only 시트용)"""
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = HEADER_ALIGNMENT
+        row.append(cell)
+    return row
+
+
+def _to_excel_value(value):
+    # numpy 타입은 openpyxl이 모르므로 파이썬 기본 타입으로 변환
+    return value.item() if hasattr(value, "item") else value
+
+
+def _load_report_data(file_my, file_others):
+    """두 파일을 읽어 병합하고 (병합 DF, 이름 컬럼, 학번 컬럼, 역량 항목 목록)을 반환"""
+    with stage("parse"):
+        df_my = pd.read_excel(file_my)
+        df_others = pd.read_excel(file_others)
 
     name_col = df_my.columns[0]
     id_col = df_my.columns[1]
 
-    # 2. 병합
-    df_merged = pd.merge(df_my, df_others, on=[name_col, id_col], suffixes=('_내가', '_남이'))
+    with stage("merge"):
+        df_merged = pd.merge(df_my, df_others, on=[name_col, id_col], suffixes=('_내가', '_남이'))
     raw_categories = df_my.columns[2:].tolist()
+    return df_merged, name_col, id_col, raw_categories
+
+
+def _iter_students(df_merged, name_col, id_col, raw_categories):
+    """학생 한 명씩 (행 값, 이름, 학번, 내가 본 점수, 남이 본 점수)를 돌려줌"""
+    for row in df_merged.itertuples(index=False, name=None):
+        record = dict(zip(df_merged.columns, row))
+        my_vals = [record[f"{cat}_내가"] for cat in raw_categories]
+        others_vals = [record[f"{cat}_남이"] for cat in raw_categories]
+        yield row, record[name_col], str(record[id_col]), my_vals, others_vals
+
+
+def generate_report_logic(file_my, file_others) -> tempfile.SpooledTemporaryFile:
+    # 1~2. 데이터 읽기 및 병합
+    df_merged, name_col, id_col, raw_categories = _load_report_data(file_my, file_others)
+
+    # 3. 엑셀 워크북 생성 (write-only: 행을 추가하는 즉시 시트별 임시 파일로 내려씀)
+    wb = Workbook(write_only=True)
 
-    # 3. 엑셀 워크북 생성
-    wb = Workbook()
-    wb.remove(wb.active)
+    # 전체 학생의 병합 데이터를 모은 요약 시트 (맨 앞)
+    ws_summary = wb.create_sheet(title="전체 요약")
+    ws_summary.append(_header_row(ws_summary, df_merged.columns.tolist()))
 
     temp_images = []
 
     try:
-        for index, row in df_merged.iterrows():
-            name = row[name_col]
-            student_id = str(row[id_col])
-
-            # 데이터 추출
-            my_vals = [row[f"{cat}_내가"] for cat in raw_categories]
-            others_vals = [row[f"{cat}_남이"] for cat in raw_categories]
+        for row, name, student_id, my_vals, others_vals in _iter_students(df_merged, name_col, id_col, raw_categories):
+            with stage("embed"):
+                ws_summary.append([_to_excel_value(v) for v in row])
 
             # 차트 생성 (폰트 적용된 함수 호출)
             img_path = create_radar_chart_img(raw_categories, my_vals, others_vals, name, student_id)
             temp_images.append(img_path)
 
-            # 시트 생성
-            sheet_name = sanitize_sheet_title(student_id)
-            ws = wb.create_sheet(title=sheet_name)
-
-            # 이미지 삽입
-            img = ExcelImage(img_path)
-            ws.add_image(img, 'A1')
-
-            # 표 데이터 추가
-            start_row = 30
-            ws.cell(row=start_row, column=1, value="역량 항목")
-            ws.cell(row=start_row, column=2, value="내가 보는 점수")
-            ws.cell(row=start_row, column=3, value="남이 보는 점수")
-
-            for i, cat in enumerate(raw_categories):
-                ws.cell(row=start_row + 1 + i, column=1, value=cat)
-                ws.cell(row=start_row + 1 + i, column=2, value=my_vals[i])
-                ws.cell(row=start_row + 1 + i, column=3, value=others_vals[i])
-
-        # 4. 결과 저장
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+            with stage("embed"):
+                # 시트 생성
+                sheet_name = sanitize_sheet_title(student_id)
+                ws = wb.create_sheet(title=sheet_name)
+
+                # 이미지 삽입 (파일 경로만 들고 있다가 저장할 때 읽어서 씀)
+                img = ExcelImage(img_path)
+                ws.add_image(img, 'A1')
+
+                # 표 데이터 추가 (차트 영역만큼 빈 행을 두고 한 번에 append)
+                for _ in range(REPORT_TABLE_START_ROW - 1):
+                    ws.append([])
+                ws.append(_header_row(ws, ["역량 항목", "내가 보는 점수", "남이 보는 점수"]))
+                for i, cat in enumerate(raw_categories):
+                    ws.append([cat, _to_excel_value(my_vals[i]), _to_excel_value(others_vals[i])])
+
+        # 4. 결과 저장 (크기가 크면 디스크로 넘어가는 임시 파일)
+        with stage("save"):
+            output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+            wb.save(output)
+            output.seek(0)
         return output
 
     finally:
@@ -204,3 +270,85 @@ def generate_report_logic(file_my, file_others) -> io.BytesIO:
                     os.remove(path)
                 except:
                     pass
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """ZipFile이 쓴 바이트를 모아뒀다가 꺼내가는 버퍼 (seek 불가 -> zip이 스트리밍 모드로 동작)"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def generate_report_zip(file_my, file_others, image_format="png"):
+    """
+    학생별 차트 이미지(PNG/SVG)를 ZIP으로 묶어 반환하는 제너레이터.
+    차트를 하나 그릴 때마다 해당 부분의 ZIP 바이트를 바로 내보냄.
+    """
+    if image_format not in ("png", "svg"):
+        raise ValueError("이미지 형식은 png 또는 svg만 가능합니다.")
+
+    # 파일 형식 오류는 응답을 보내기 전에 터지도록 먼저 읽어둠
+    df_merged, name_col, id_col, raw_categories = _load_report_data(file_my, file_others)
+
+    def stream():
+        buffer = _ChunkBuffer()
+        # PNG는 이미 압축돼 있으므로 그대로 저장, SVG(텍스트)만 압축
+        compression = zipfile.ZIP_STORED if image_format == "png" else zipfile.ZIP_DEFLATED
+
+        used_names = set()
+
+        with zipfile.ZipFile(buffer, mode="w", compression=compression) as zf:
+            for _, name, student_id, my_vals, others_vals in _iter_students(df_merged, name_col, id_col, raw_categories):
+                data = create_radar_chart_bytes(raw_categories, my_vals, others_vals, name, student_id, image_format)
+
+                # 학번·이름이 같은 행이 여러 개면 _2, _3 ... 을 붙여 파일명 중복 방지
+                base = f"{sanitize_sheet_title(student_id)}_{sanitize_sheet_title(name)}"
+                entry_name, n = f"{base}.{image_format}", 1
+                while entry_name in used_names:
+                    n += 1
+                    entry_name = f"{base}_{n}.{image_format}"
+                used_names.add(entry_name)
+
+                zf.writestr(entry_name, data)
+                yield buffer.drain()
+
+        yield buffer.drain()  # 중앙 디렉터리(파일 목록)
+
+    return stream()
+
+
+def generate_report_pdf(file_my, file_others) -> tempfile.SpooledTemporaryFile:
+    """학생 한 명당 한 페이지씩 차트를 담은 PDF (matplotlib PdfPages)"""
+    df_merged, name_col, id_col, raw_categories = _load_report_data(file_my, file_others)
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    with PdfPages(output) as pdf:
+        for _, name, student_id, my_vals, others_vals in _iter_students(df_merged, name_col, id_col, raw_categories):
+            with stage("render"):
+                fig = draw_radar_chart(raw_categories, my_vals, others_vals, name, student_id)
+            with stage("save"):
+                pdf.savefig(fig, bbox_inches='tight')
+
+    output.seek(0)
+    return output
+
+
+def iter_file(file, chunk_size: int = 64 * 1024):
+    """StreamingResponse용: 파일을 청크 단위로 읽어 보내고 다 보내면 닫음"""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
@@ -3,6 +3,8 @@ from PIL import Image, ImageDraw, ImageFont
 import os
 from uuid import UUID
 
+from profiling import stage
+
 # QR 저장 경로
 QR_PATH = "static/qrcodes"
 FONT_PATH = "static/fonts/malgunbd.ttf"
@@ -28,11 +30,12 @@ def generate_booth_qr(booth_id: UUID, booth_name: str, domain_url: str):
         box_size=10,
         border=2,  # 테두리는 얇게 (글씨 공간 확보)
     )
-    qr.add_data(target_url)
-    qr.make(fit=True)
+    with stage("qr_make"):
+        qr.add_data(target_url)
+        qr.make(fit=True)
 
-    # 3. 기본 QR 이미지 생성 (RGB 모드로 변환해야 컬러/텍스트 작업 가능)
-    qr_img = qr.make_image(fill_color="black", back_color="white").convert('RGB')
+        # 3. 기본 QR 이미지 생성 (RGB 모드로 변환해야 컬러/텍스트 작업 가능)
+        qr_img = qr.make_image(fill_color="black", back_color="white").convert('RGB')
 
     # (1) 폰트 로드
     try:
@@ -78,7 +81,8 @@ def generate_booth_qr(booth_id: UUID, booth_name: str, domain_url: str):
 
     # 4. 파일 저장 (파일명은 UUID로 하여 유니크하게 관리)
     file_path = os.path.join(QR_PATH, f"{booth_id}.png")
-    new_img.save(file_path)
+    with stage("save"):
+        new_img.save(file_path)
 
     # 웹에서 접근 가능한 경로 반환 (/booth 서브경로 포함)
     return f"/booth/static/qrcodes/{booth_id}.png"
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from bson import Binary
+
+from cache import get_cache
+from models import Booth, Survey
+
+# 같은 조건의 대시보드 조회는 이 시간(초) 동안 캐시된 결과를 돌려줌
+ANALYTICS_CACHE_TTL = 30
+
+# 허용하는 버킷 크기(분) - 너무 잘게 쪼개 결과가 폭증하는 것 방지
+ALLOWED_BUCKETS = (1, 5, 10, 15, 30, 60, 120, 180, 360, 720, 1440)
+
+ALLOWED_GROUPS = ("booth", "global")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_local_naive(value: datetime) -> datetime:
+    """
+    Survey.created_at은 로컬 시각(naive)으로 저장되므로 조회 범위도 같은 형태로 맞춤.
+    (타임존이 붙은 값을 그대로 넘기면 pymongo가 UTC로 바꿔서 엉뚱한 구간을 조회함)
+    """
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _as_uuid(value) -> UUID:
+    # 기본 uuidRepresentation에서는 aggregate 결과의 UUID가 bson.Binary(subtype 4)로 옴
+    return value.as_uuid() if isinstance(value, Binary) else value
+
+
+def build_vote_pipeline(start: datetime, end: datetime, bucket_minutes: int, per_booth: bool, booth_id: UUID | None = None) -> list[dict]:
+    """
+    surveys 컬렉션용 집계 파이프라인을 만듭니다.
+    booth_id가 있으면 (booth_id, created_at) 인덱스, 없으면 created_at 인덱스를 타도록 $match를 맨 앞에 둡니다.
+    """
+    match = {"created_at": {"$gte": start, "$lt": end}}
+    if booth_id is not None:
+        match = {"booth_id": Binary.from_uuid(booth_id), **match}
+
+    group_id = {
+        "bucket": {"$dateTrunc": {"date": "$created_at", "unit": "minute", "binSize": bucket_minutes}}
+    }
+    if per_booth:
+        group_id["booth_id"] = "$booth_id"
+
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": group_id,
+            "votes": {"$sum": 1},
+            "total_score": {"$sum": "$score"},
+        }},
+        {"$sort": {"_id.bucket": 1, "votes": -1}},
+    ]
+
+
+async def get_vote_stats(start: datetime, end: datetime, bucket_minutes: int = 60, per_booth: bool = True,
+                         booth_id: UUID | None = None) -> list[dict]:
+    """기간/버킷/그룹(+특정 부스) 조건별 투표 수와 평균 점수 (짧은 TTL로 캐시)"""
+    start = to_local_naive(start)
+    end = to_local_naive(end)
+
+    if bucket_minutes not in ALLOWED_BUCKETS:
+        raise ValueError(f"bucket은 {ALLOWED_BUCKETS} 중 하나여야 합니다.")
+    if end <= start:
+        raise ValueError("종료 시각이 시작 시각보다 늦어야 합니다.")
+
+    cache = get_cache()
+    cache_key = f"stats:{start.isoformat()}:{end.isoformat()}:{bucket_minutes}:{int(per_booth)}:{booth_id or '*'}"
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    pipeline = build_vote_pipeline(start, end, bucket_minutes, per_booth, booth_id)
+    rows = await Survey.aggregate(pipeline).to_list()
+
+    booth_names = {}
+    if per_booth:
+        booths = await Booth.find_all().to_list()
+        booth_names = {str(booth.booth_id): booth.name for booth in booths}
+
+    # 캐시(MongoDB)에도 그대로 저장할 수 있도록 문자열/숫자로만 구성
+    result = []
+    for row in rows:
+        item = {
+            "bucket": row["_id"]["bucket"].isoformat(),
+            "votes": row["votes"],
+            "total_score": row["total_score"],
+            "avg_score": round(row["total_score"] / row["votes"], 2) if row["votes"] else 0.0,
+        }
+        if per_booth:
+            row_booth_id = str(_as_uuid(row["_id"]["booth_id"]))
+            item["booth_id"] = row_booth_id
+            item["booth_name"] = booth_names.get(row_booth_id, "")
+        result.append(item)
+
+    await cache.set(cache_key, result, ttl=ANALYTICS_CACHE_TTL)
+    return result
+
+
+def default_range(bucket_minutes: int, hours: int = 24) -> tuple[datetime, datetime]:
+    """
+    기간을 안 넘기면 최근 24시간 (Survey.created_at과 같은 로컬 시각 기준).
+    끝 시각을 다음 버킷 경계로 올려서, 같은 버킷 안의 반복 조회가 같은 캐시 키를 쓰도록 함
+    """
+    minutes = int((datetime.now() - _EPOCH).total_seconds() // 60)
+    end = _EPOCH + timedelta(minutes=(minutes // bucket_minutes + 1) * bucket_minutes)
+    return end - timedelta(hours=hours), end
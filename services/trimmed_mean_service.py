@@ -0,0 +1,173 @@
+import math
+from collections import Counter, OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 프로세스 메모리에 상태를 유지할 데이터셋 수 (오래 안 쓴 것부터 버림)
+MAX_DATASETS = 32
+
+
+def _push_extreme(extremes: list, value: float, known_count: int, reverse: bool) -> list:
+    """
+    extremes(가장 작은/큰 값 목록)에 value를 반영.
+    삭제로 목록이 덜 채워진 상태면, value가 확실히 그 범위 안일 때만 추가
+    """
+    complete = len(extremes) >= min(2, known_count)
+    beyond = extremes and (value > extremes[-1] if not reverse else value < extremes[-1])
+    if not complete and beyond:
+        return extremes
+    return sorted(extremes + [value], reverse=reverse)[:2]
+
+
+class ColumnStats:
+    """
+    한 그룹·한 항목의 절사 평균 계산용 요약 통계.
+    합계/개수와 가장 작은 값 2개, 가장 큰 값 2개만 들고 있으므로
+    행이 추가되면 바로 갱신하고, 삭제돼도 극단값을 모두 잃기 전까지는 재계산이 필요 없음.
+    """
+
+    __slots__ = ("total", "count", "nan_count", "low", "high")
+
+    def __init__(self):
+        self.total = 0.0
+        self.count = 0
+        self.nan_count = 0
+        self.low = []   # 오름차순, 최대 2개
+        self.high = []  # 내림차순, 최대 2개
+
+    def add(self, value: float):
+        if math.isnan(value):
+            self.nan_count += 1
+            return
+        self.low = _push_extreme(self.low, value, self.count, reverse=False)
+        self.high = _push_extreme(self.high, value, self.count, reverse=True)
+        self.total += value
+        self.count += 1
+
+    def remove(self, value: float) -> bool:
+        """값을 빼고, 최솟값/최댓값을 더 이상 알 수 없으면 False (전체 재계산 필요)"""
+        if math.isnan(value):
+            self.nan_count -= 1
+            return True
+        self.total -= value
+        self.count -= 1
+        if value in self.low:
+            self.low.remove(value)
+        if value in self.high:
+            self.high.remove(value)
+        return self.count == 0 or bool(self.low and self.high)
+
+    def trimmed_mean(self) -> float:
+        """
+        기존 로직(col.sort_values().iloc[1:-1].mean())과 같은 결과.
+        NaN은 정렬 시 맨 뒤로 가므로, NaN이 있으면 최댓값 대신 NaN 하나가 잘려나감.
+        """
+        if self.count + self.nan_count <= 2:
+            return float("nan")
+        if self.nan_count == 0:
+            return round((self.total - self.low[0] - self.high[0]) / (self.count - 2), 2)
+        if self.count <= 1:
+            return float("nan")
+        return round((self.total - self.low[0]) / (self.count - 1), 2)
+
+
+class GroupState:
+    """(이름, 학번) 그룹 하나의 행 해시와 항목별 통계"""
+
+    def __init__(self, signature, rows: Counter, values: dict, stats: list[ColumnStats]):
+        self.signature = signature
+        self.rows = rows        # {행 해시: 개수}
+        self.values = values    # {행 해시: 항목 값 튜플}
+        self.stats = stats
+        self.result = tuple(s.trimmed_mean() for s in stats)
+
+    @classmethod
+    def build(cls, signature, hashes, values, num_cols: int):
+        stats = [ColumnStats() for _ in range(num_cols)]
+        for row in values:
+            for s, v in zip(stats, row):
+                s.add(v)
+        return cls(signature, Counter(hashes), dict(zip(hashes, map(tuple, values))), stats)
+
+    def update(self, signature, hashes, values) -> bool:
+        """바뀐 행만 반영. 증분 갱신이 불가능하면 False"""
+        new_rows = Counter(hashes)
+        new_values = dict(zip(hashes, map(tuple, values)))
+
+        for h, n in (self.rows - new_rows).items():
+            for _ in range(n):
+                if not all(s.remove(v) for s, v in zip(self.stats, self.values[h])):
+                    return False
+        for h, n in (new_rows - self.rows).items():
+            for _ in range(n):
+                for s, v in zip(self.stats, new_values[h]):
+                    s.add(v)
+
+        self.signature = signature
+        self.rows = new_rows
+        self.values = new_values
+        self.result = tuple(s.trimmed_mean() for s in self.stats)
+        return True
+
+
+# { dataset_id: {"columns": 컬럼 튜플, "groups": {(이름, 학번): GroupState}} }
+_datasets: OrderedDict[str, dict] = OrderedDict()
+
+
+def _group_signature(hashes: np.ndarray):
+    # 행 순서와 무관한 그룹 지문 (개수, 해시 합, 해시 XOR)
+    return len(hashes), int(hashes.sum(dtype=np.uint64)), int(np.bitwise_xor.reduce(hashes))
+
+
+def calculate_trimmed_mean_incremental(df: pd.DataFrame, dataset_id: str) -> tuple[pd.DataFrame, int]:
+    """
+    calculate_trimmed_mean_logic의 상태 유지 버전.
+    같은 dataset_id로 다시 올라온 시트는 행 해시를 비교해서 바뀐 그룹만 다시 계산합니다.
+    (결과 DataFrame, 다시 계산한 그룹 수)를 반환합니다.
+    """
+    if len(df.columns) < 3:
+        raise ValueError("데이터 컬럼이 부족합니다.")
+
+    name_col = df.columns[0]
+    id_col = df.columns[1]
+    value_cols = df.columns[2:]
+    columns = tuple(df.columns)
+
+    state = _datasets.get(dataset_id)
+    if state is None or state["columns"] != columns:
+        state = {"columns": columns, "groups": {}}
+    _datasets[dataset_id] = state
+    _datasets.move_to_end(dataset_id)
+    while len(_datasets) > MAX_DATASETS:
+        _datasets.popitem(last=False)
+
+    # groupby와 마찬가지로 키가 비어 있는 행은 제외
+    df = df.dropna(subset=[name_col, id_col])
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    values = df[value_cols].to_numpy(dtype=float)
+
+    groups = state["groups"]
+    new_groups = {}
+    recomputed = 0
+
+    for key, idx in df.groupby([name_col, id_col], sort=True).indices.items():
+        group_hashes = hashes[idx]
+        signature = _group_signature(group_hashes)
+        group = groups.get(key)
+
+        if group is not None and group.signature == signature:
+            new_groups[key] = group
+            continue
+
+        recomputed += 1
+        if group is None or not group.update(signature, group_hashes.tolist(), values[idx]):
+            group = GroupState.build(signature, group_hashes.tolist(), values[idx], len(value_cols))
+        new_groups[key] = group
+
+    # 시트에서 사라진 그룹은 new_groups에 없으므로 자연스럽게 제거됨
+    state["groups"] = new_groups
+
+    records = [(*key, *group.result) for key, group in new_groups.items()]
+    df_result = pd.DataFrame(records, columns=[name_col, id_col, *value_cols])
+    return df_result, recomputed
@@ -0,0 +1,124 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import tempfile
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+STATIC_DIR = "static"
+STATIC_URL = "/booth/static"
+
+# 미리 압축해 둘 파일 목록 (lifespan에서 한 번 생성)
+PRECOMPRESSED_FILES = ["css/style.css", "images/dmu-logo.png"]
+
+# 해시가 붙은 URL은 내용이 바뀌면 URL도 바뀌므로 1년 + immutable
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+DEFAULT_CACHE = "public, max-age=300"
+
+# { 상대경로: (mtime, 해시) }
+_hash_cache: dict[str, tuple[float, str]] = {}
+
+
+def file_hash(path: str) -> str:
+    """정적 파일 내용의 짧은 해시 (mtime이 바뀔 때만 다시 계산)"""
+    full_path = os.path.join(STATIC_DIR, path)
+    mtime = os.path.getmtime(full_path)
+
+    cached = _hash_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(full_path, "rb") as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    _hash_cache[path] = (mtime, digest)
+    return digest
+
+
+def static_url(path: str) -> str:
+    """템플릿용: 내용 해시가 붙은 정적 파일 URL (/booth/static/css/style.css?v=abcd...)"""
+    try:
+        return f"{STATIC_URL}/{path}?v={file_hash(path)}"
+    except OSError:
+        return f"{STATIC_URL}/{path}"
+
+
+def precompress_static_files():
+    """
+    PRECOMPRESSED_FILES의 .gz 버전을 미리 만들어 둡니다.
+    PNG처럼 이미 압축된 파일은 크기가 줄어들 때만 .gz를 남깁니다.
+    """
+    for path in PRECOMPRESSED_FILES:
+        full_path = os.path.join(STATIC_DIR, path)
+        gz_path = full_path + ".gz"
+        if not os.path.exists(full_path):
+            continue
+        if os.path.exists(gz_path) and os.path.getmtime(gz_path) >= os.path.getmtime(full_path):
+            continue
+
+        with open(full_path, "rb") as f:
+            data = f.read()
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+
+        if len(compressed) < len(data):
+            # 여러 워커가 동시에 기동해도 쓰다 만 .gz가 보이지 않도록 임시 파일에 쓰고 교체
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(full_path), suffix=".gz.tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(compressed)
+                os.replace(tmp_path, gz_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        else:
+            try:
+                os.remove(gz_path)
+            except FileNotFoundError:
+                pass
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    - Accept-Encoding에 gzip이 있고 미리 압축된 .gz 파일이 있으면 그걸 전송 (Range 요청 제외)
+    - ?v=<해시>가 현재 파일 해시와 같으면 immutable 캐시 헤더를 붙임
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        request_headers = Headers(scope=scope)
+        gz_path = f"{full_path}.gz"
+
+        # Range 요청은 원본 기준으로 처리 (압축본 일부를 보내면 클라이언트가 풀 수 없음)
+        use_gzip = "gzip" in request_headers.get("accept-encoding", "") and "range" not in request_headers
+        if use_gzip and os.path.isfile(gz_path):
+            media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+            response = FileResponse(
+                gz_path,
+                status_code=status_code,
+                media_type=media_type,
+                stat_result=os.stat(gz_path),
+                headers={"Content-Encoding": "gzip"},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+        else:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = self._cache_control(full_path, scope)
+        return response
+
+    def _cache_control(self, full_path, scope) -> str:
+        version = QueryParams(scope.get("query_string", b"")).get("v")
+        if not version:
+            return DEFAULT_CACHE
+
+        rel_path = os.path.relpath(str(full_path), os.path.realpath(STATIC_DIR))
+        try:
+            if version == file_hash(rel_path):
+                return IMMUTABLE_CACHE
+        except OSError:
+            pass
+        return DEFAULT_CACHE
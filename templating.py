@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+import os
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from uuid import UUID
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+from cache import get_version, bump_version
+from static_assets import static_url
+
+TEMPLATE_DIR = "templates"
+
+# 운영에서는 템플릿 파일 mtime 검사를 생략 (개발 중엔 TEMPLATE_AUTO_RELOAD=1)
+AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "0") == "1"
+
+# 렌더링 결과 캐시에 보관할 최대 항목 수 (Host 헤더 조작 등으로 무한히 늘어나는 것 방지)
+PAGE_CACHE_MAX = 1024
+
+# 버전이 같아도 이 시간(초)이 지나면 다시 렌더링
+# (memory 백엔드처럼 버전이 워커끼리 공유되지 않는 경우에도 옛 페이지가 이 이상 남지 않도록)
+PAGE_CACHE_MAX_AGE = float(os.getenv("PAGE_CACHE_MAX_AGE", "30"))
+
+# --- [공용 Jinja2 환경] ---
+# 라우터마다 따로 만들던 환경을 하나로 합치고, 컴파일된 바이트코드를 디스크에 캐시
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=AUTO_RELOAD,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+templates = Jinja2Templates(env=env)
+templates.env.globals["static_url"] = static_url  # 내용 해시가 붙은 정적 파일 URL
+
+
+# --- [부스별 렌더링 HTML 캐시] ---
+# HTML 자체는 워커마다 로컬에 두고, 무효화 여부는 공유 캐시(cache.py)의 버전 번호로 판단
+# { booth_uuid(str): { (템플릿, base_url, 경로상의 booth id): (version, rendered_at, body, gzip body, etag, last_modified) } }
+_page_cache: dict[str, dict[tuple, tuple[tuple, float, bytes, bytes, str, float]]] = {}
+
+
+def _booth_key(booth_id) -> str:
+    return str(UUID(str(booth_id)))
+
+
+def _gzip_etag(etag: str) -> str:
+    # 강한 ETag는 content-coding마다 달라야 하므로 압축본은 "<해시>-gz"
+    return etag[:-1] + '-gz"'
+
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # 압축본/원본 어느 쪽 태그로 와도 같은 내용이므로 304
+        candidates = {etag, _gzip_etag(etag)}
+        return "*" in tags or any(tag in candidates or tag[2:] in candidates for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= int(last_modified)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+async def _page_version(booth_key: str) -> tuple:
+    # 전체 초기화(reset_all)와 개별 부스 수정을 모두 반영
+    return await get_version("booths"), await get_version(f"booth:{booth_key}")
+
+
+async def cached_booth_page(request: Request, template_name: str, booth_id: str) -> tuple[Response | None, tuple]:
+    """
+    부스 랜딩 페이지를 캐시에서만 찾습니다.
+    (캐시된 응답 또는 None, 조회 시점의 버전)을 반환하며, 캐시가 없으면 호출하는 쪽에서
+    DB 조회 후 이 버전을 그대로 render_booth_page에 넘겨야 합니다.
+    (DB 조회 도중 수정이 일어나면 옛 내용이 새 버전으로 저장되는 것을 막기 위해)
+    """
+    booth_key = _booth_key(booth_id)
+    version = await _page_version(booth_key)
+
+    entry = _page_cache.get(booth_key, {}).get((template_name, str(request.base_url), booth_id))
+    if entry is None or entry[0] != version or time.monotonic() - entry[1] >= PAGE_CACHE_MAX_AGE:
+        return None, version
+    return _page_response(request, entry), version
+
+
+async def render_booth_page(request: Request, template_name: str, booth_id: str, context: dict, booth, version: tuple) -> Response:
+    """부스 랜딩 페이지를 렌더링해서 version(cached_booth_page에서 받은 값)으로 캐시하고 응답합니다."""
+    booth_key = _booth_key(booth_id)
+    variant = (template_name, str(request.base_url), booth_id)
+
+    body = templates.get_template(template_name).render({**context, "request": request, "booth": booth}).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    # 만료돼서 다시 렌더링했는데 내용이 같으면 Last-Modified는 그대로 유지
+    previous = _page_cache.get(booth_key, {}).get(variant)
+    last_modified = previous[5] if previous and previous[4] == etag else time.time()
+
+    # 압축본도 같이 보관해서 GZipMiddleware가 매번 다시 압축하지 않게 함
+    entry = (version, time.monotonic(), body, gzip.compress(body, mtime=0), etag, last_modified)
+
+    if sum(len(pages) for pages in _page_cache.values()) >= PAGE_CACHE_MAX:
+        _page_cache.clear()
+    _page_cache.setdefault(booth_key, {})[variant] = entry
+
+    return _page_response(request, entry)
+
+
+def _page_response(request: Request, entry: tuple) -> Response:
+    _, _, body, gzip_body, etag, last_modified = entry
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "ETag": _gzip_etag(etag) if use_gzip else etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",  # 매번 재검증하되, 바뀐 게 없으면 304
+        "Vary": "Accept-Encoding",
+    }
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        return HTMLResponse(content=gzip_body, headers={**headers, "Content-Encoding": "gzip"})
+    return HTMLResponse(content=body, headers=headers)
+
+
+async def invalidate_booth_pages(booth_id=None):
+    """
+    부스 수정/삭제 시 해당 부스의 렌더링 캐시를 비웁니다. booth_id가 없으면 전체 삭제.
+    다른 워커는 공유 캐시의 버전 변경을 보고 자기 로컬 캐시를 버립니다.
+    """
+    if booth_id is None:
+        _page_cache.clear()
+        await bump_version("booths")
+        return
+    booth_key = _booth_key(booth_id)
+    _page_cache.pop(booth_key, None)
+    await bump_version(f"booth:{booth_key}")
@@ -0,0 +1,224 @@
+import asyncio
+import os
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+import cache
+import templating
+from cache import MemoryCache, init_cache, get_cache, get_version, bump_version
+from templating import cached_booth_page, render_booth_page, invalidate_booth_pages
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    # DB 없이 memory 백엔드로 초기화 (템플릿은 프로젝트 루트 기준 경로)
+    monkeypatch.chdir(PROJECT_ROOT)
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "memory")
+    asyncio.run(init_cache(None))
+    templating._page_cache.clear()
+    yield
+    templating._page_cache.clear()
+
+
+def make_request(path: str, headers: dict | None = None) -> Request:
+    raw_headers = [(b"host", b"testserver")]
+    raw_headers += [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "root_path": "",
+        "path": path,
+        "query_string": b"",
+        "headers": raw_headers,
+    })
+
+
+async def get_survey_page(booth_id: str, name: str, headers: dict | None = None):
+    """routers.user.get_survey_page와 같은 순서 (DB 조회 대신 name으로 부스를 만듦)"""
+    request = make_request(f"/booth/survey/{booth_id}", headers)
+    cached, version = await cached_booth_page(request, "survey.html", booth_id)
+    if cached:
+        return cached, True
+    booth = SimpleNamespace(name=name)
+    return await render_booth_page(request, "survey.html", booth_id, {}, booth, version), False
+
+
+# --- MemoryCache ---
+
+def test_memory_cache_ttl_expires():
+    async def scenario():
+        backend = MemoryCache()
+        await backend.set("short", "value", ttl=0.05)
+        await backend.set("forever", "value")
+        assert await backend.get("short") == "value"
+
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        assert await backend.get("short", "default") == "default"
+        assert await backend.get("forever") == "value"
+
+    asyncio.run(scenario())
+
+
+def test_memory_cache_sweeps_expired_keys_on_set(monkeypatch):
+    async def scenario():
+        backend = MemoryCache()
+        await backend.set("never-read-again", "value", ttl=0.01)
+        await asyncio.sleep(0.02)
+
+        monkeypatch.setattr(MemoryCache, "SWEEP_INTERVAL", 0)
+        await backend.set("other", "value")
+        assert "never-read-again" not in backend._data
+        assert "other" in backend._data
+
+    asyncio.run(scenario())
+
+
+def test_memory_cache_incr():
+    async def scenario():
+        backend = MemoryCache()
+        assert await backend.incr("counter") == 1
+        assert await backend.incr("counter", 5) == 6
+        assert await backend.get("counter") == 6
+
+        # TTL이 있던 키도 incr 후에는 만료되지 않음
+        await backend.set("expiring", 1, ttl=0.05)
+        assert await backend.incr("expiring") == 2
+        await asyncio.sleep(0.1)
+        assert await backend.get("expiring") == 2
+
+    asyncio.run(scenario())
+
+
+# --- 버전 번호 ---
+
+def test_version_memo_waits_for_check_interval(monkeypatch):
+    async def scenario():
+        assert await get_version("booths") == 0
+
+        # 다른 워커가 공유 저장소의 버전을 올린 상황
+        await get_cache().incr("version:booths")
+        assert await get_version("booths") == 0  # 아직 로컬 값 재사용
+
+        monkeypatch.setattr(cache, "VERSION_CHECK_INTERVAL", 0)
+        assert await get_version("booths") == 1
+
+    asyncio.run(scenario())
+
+
+def test_bump_version_is_visible_locally_at_once():
+    async def scenario():
+        assert await get_version("booth:a") == 0
+        assert await bump_version("booth:a") == 1
+        assert await get_version("booth:a") == 1
+
+    asyncio.run(scenario())
+
+
+def test_version_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(cache, "VERSION_MEMO_MAX", 2)
+
+    async def scenario():
+        for name in ("a", "b", "c"):
+            await get_version(name)
+        assert list(cache._version_memo) == ["b", "c"]
+
+        # 다시 읽은 키는 가장 최근으로 이동
+        await get_version("b")
+        await get_version("d")
+        assert list(cache._version_memo) == ["b", "d"]
+
+    asyncio.run(scenario())
+
+
+# --- 부스 페이지 캐시 ---
+
+def test_booth_page_is_cached_until_invalidated():
+    booth_id = str(uuid4())
+
+    async def scenario():
+        first, from_cache = await get_survey_page(booth_id, "처음 이름")
+        assert not from_cache
+        assert "처음 이름" in first.body.decode()
+
+        again, from_cache = await get_survey_page(booth_id, "바뀐 이름")
+        assert from_cache
+        assert again.body == first.body
+
+        await invalidate_booth_pages(booth_id)
+        updated, from_cache = await get_survey_page(booth_id, "바뀐 이름")
+        assert not from_cache
+        assert "바뀐 이름" in updated.body.decode()
+
+    asyncio.run(scenario())
+
+
+def test_reset_all_invalidates_every_booth():
+    booth_id = str(uuid4())
+
+    async def scenario():
+        await get_survey_page(booth_id, "처음 이름")
+        await invalidate_booth_pages()
+        _, from_cache = await get_survey_page(booth_id, "처음 이름")
+        assert not from_cache
+
+    asyncio.run(scenario())
+
+
+def test_page_rendered_under_older_version_is_not_served():
+    booth_id = str(uuid4())
+
+    async def scenario():
+        # 캐시 확인 → (DB 조회 도중 다른 요청이 부스를 수정) → 옛 내용으로 렌더링
+        request = make_request(f"/booth/survey/{booth_id}")
+        _, version = await cached_booth_page(request, "survey.html", booth_id)
+        await invalidate_booth_pages(booth_id)
+        await render_booth_page(request, "survey.html", booth_id, {}, SimpleNamespace(name="옛 이름"), version)
+
+        page, from_cache = await get_survey_page(booth_id, "새 이름")
+        assert not from_cache
+        assert "새 이름" in page.body.decode()
+
+    asyncio.run(scenario())
+
+
+def test_page_is_rerendered_after_max_age(monkeypatch):
+    booth_id = str(uuid4())
+
+    async def scenario():
+        first, _ = await get_survey_page(booth_id, "처음 이름")
+
+        # 버전이 그대로여도(다른 워커에서 수정된 경우 등) 오래된 페이지는 다시 렌더링
+        monkeypatch.setattr(templating, "PAGE_CACHE_MAX_AGE", 0)
+        page, from_cache = await get_survey_page(booth_id, "바뀐 이름")
+        assert not from_cache
+        assert "바뀐 이름" in page.body.decode()
+
+        # 내용이 같으면 Last-Modified는 유지
+        same, _ = await get_survey_page(booth_id, "바뀐 이름")
+        assert same.headers["last-modified"] == page.headers["last-modified"]
+
+    asyncio.run(scenario())
+
+
+def test_gzip_variant_revalidates_with_either_etag():
+    booth_id = str(uuid4())
+
+    async def scenario():
+        plain, _ = await get_survey_page(booth_id, "이름")
+        gzipped, _ = await get_survey_page(booth_id, "이름", {"Accept-Encoding": "gzip"})
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.headers["etag"] != plain.headers["etag"]
+
+        for etag in (plain.headers["etag"], gzipped.headers["etag"]):
+            response, _ = await get_survey_page(booth_id, "이름", {"If-None-Match": etag})
+            assert response.status_code == 304
+
+    asyncio.run(scenario())
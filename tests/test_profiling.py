@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+import cache
+import profiling
+from cache import init_cache
+from profiling import ProfilingMiddleware, set_profiling_enabled, stage
+
+ADMIN_COOKIE = {"admin_session": "valid_admin"}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(profiling, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profiling, "_toggle_memo", None)
+    asyncio.run(init_cache(None))
+
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/booth/entry/{booth_id}")
+    def entry(booth_id: str):
+        return PlainTextResponse(booth_id)
+
+    @app.post("/analysis/calc-average/preview")
+    def preview():
+        with stage("compute"):
+            pass
+        return PlainTextResponse("ok")
+
+    return TestClient(app)
+
+
+def test_server_timing_only_for_admin(client):
+    response = client.get("/booth/entry/abc")
+    assert "server-timing" not in response.headers
+
+    client.cookies.update(ADMIN_COOKIE)
+    response = client.get("/booth/entry/abc")
+    assert response.headers["server-timing"].startswith("total;dur=")
+    assert "x-profile-id" not in response.headers
+
+
+def test_toggle_profiles_non_admin_without_exposing_headers(client, tmp_path):
+    asyncio.run(set_profiling_enabled(True))
+
+    response = client.post("/analysis/calc-average/preview")
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+    assert "x-profile-id" not in response.headers
+    assert len(list(tmp_path.glob("*.prof"))) == 1
+
+    client.cookies.update(ADMIN_COOKIE)
+    response = client.post("/analysis/calc-average/preview")
+    assert "compute;dur=" in response.headers["server-timing"]
+    assert (tmp_path / response.headers["x-profile-id"]).is_file()
+
+
+def test_profile_dir_is_capped(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "MAX_PROFILES", 3)
+    client.cookies.update(ADMIN_COOKIE)
+
+    names = [client.get("/booth/entry/abc", headers={"X-Profile": "1"}).headers["x-profile-id"] for _ in range(5)]
+    assert sorted(p.name for p in tmp_path.glob("*.prof")) == sorted(names[-3:])
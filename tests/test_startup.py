@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# main import에 허용하는 시간(초). 느린 CI에서는 STARTUP_BUDGET_SECONDS로 조정
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "5"))
+
+HEAVY_MODULES = ("pandas", "matplotlib", "openpyxl")
+
+# 새 프로세스에서 main을 import하고 소요 시간/RSS/무거운 모듈 로드 여부를 JSON으로 출력
+# (RUN_LIFESPAN=1이면 lifespan 시작까지 실행. DB 연결 대신 메모리 캐시만 초기화)
+PROBE = f"""
+import asyncio, json, os, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+
+if os.environ.get("RUN_LIFESPAN") == "1":
+    from cache import init_cache
+
+    async def init_db():
+        await init_cache(None)
+
+    async def run_lifespan():
+        async with main.lifespan(main.app):
+            await asyncio.sleep(0.5)  # 백그라운드 로드가 있다면 시작될 시간
+
+    main.init_db = init_db
+    asyncio.run(run_lifespan())
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024
+except ImportError:
+    rss_kb = None
+heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "rss_kb": rss_kb, "heavy": heavy}}))
+"""
+
+
+def import_main(enable_analysis: str, cwd: str = PROJECT_ROOT, run_lifespan: bool = False) -> dict:
+    env = {
+        **os.environ,
+        "ENABLE_ANALYSIS": enable_analysis,
+        "RUN_LIFESPAN": "1" if run_lifespan else "0",
+        "PYTHONPATH": PROJECT_ROOT,
+    }
+    env.pop("WARM_ANALYSIS_IMPORTS", None)  # 기본 설정 그대로 확인
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("enable_analysis", ["0", "1"])
+def test_main_import_skips_analysis_libraries(enable_analysis):
+    report = import_main(enable_analysis)
+
+    rss = f"{report['rss_kb'] / 1024:.1f}MB" if report["rss_kb"] else "unknown"
+    print(f"ENABLE_ANALYSIS={enable_analysis}: import main {report['elapsed']:.2f}s, max RSS {rss}")
+
+    # 투표 요청만 받는 워커가 pandas/matplotlib/openpyxl을 끌어오면 안 됨
+    assert report["heavy"] == []
+    assert report["elapsed"] < STARTUP_BUDGET_SECONDS
+
+
+def test_lifespan_keeps_analysis_libraries_unloaded(tmp_path):
+    # 기본 설정(ENABLE_ANALYSIS=1)으로 기동을 마쳐도 첫 분석 요청 전까지는 로드하지 않아야 함
+    # (lifespan이 만드는 static/qrcodes 등은 임시 폴더에 생성)
+    (tmp_path / "static").mkdir()
+    report = import_main("1", cwd=str(tmp_path), run_lifespan=True)
+
+    assert report["heavy"] == []
@@ -0,0 +1,116 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.analysis_service import calculate_trimmed_mean_logic
+from services.trimmed_mean_service import calculate_trimmed_mean_incremental, _datasets
+
+COLUMNS = ["이름", "학번", "소통", "협업", "책임감"]
+
+# 기존 calculate_trimmed_mean_logic의 groupby.apply 경고 (비교 대상이므로 그대로 둠)
+pytestmark = pytest.mark.filterwarnings("ignore:DataFrameGroupBy.apply operated on the grouping columns:FutureWarning")
+
+
+@pytest.fixture(autouse=True)
+def clear_datasets():
+    _datasets.clear()
+    yield
+    _datasets.clear()
+
+
+def make_sheet() -> pd.DataFrame:
+    # 학생 4명, 학생마다 평가자 5명
+    rows = []
+    for i, name in enumerate(["김민수", "이서연", "박지훈", "최유진"]):
+        for j in range(5):
+            rows.append([name, 20240001 + i, (i + j) % 5 + 1, (i * 2 + j) % 5 + 1, (j * 3 + i) % 5 + 1])
+    return pd.DataFrame(rows, columns=COLUMNS).astype({c: float for c in COLUMNS[2:]})
+
+
+def assert_matches_original(df: pd.DataFrame, dataset_id: str = "sheet") -> int:
+    """증분 결과가 기존 calculate_trimmed_mean_logic과 같은지 확인하고 재계산한 그룹 수를 반환"""
+    result, recomputed = calculate_trimmed_mean_incremental(df, dataset_id)
+    expected = calculate_trimmed_mean_logic(df)
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False,
+    )
+    return recomputed
+
+
+def test_only_changed_groups_are_recomputed():
+    df = make_sheet()
+    assert assert_matches_original(df) == 4
+
+    # 같은 시트를 행 순서만 바꿔 다시 올림
+    df = df.sample(frac=1, random_state=0).reset_index(drop=True)
+    assert assert_matches_original(df) == 0
+
+    # 행 추가 (김민수)
+    df = pd.concat([df, pd.DataFrame([["김민수", 20240001, 5.0, 1.0, 3.0]], columns=COLUMNS)], ignore_index=True)
+    assert assert_matches_original(df) == 1
+
+    # 행 삭제 (이서연의 첫 번째 행)
+    df = df.drop(df.index[df["이름"] == "이서연"][0]).reset_index(drop=True)
+    assert assert_matches_original(df) == 1
+
+    # 값 수정 (박지훈)
+    df.loc[df.index[df["이름"] == "박지훈"][0], "협업"] = 4.5
+    assert assert_matches_original(df) == 1
+
+    # NaN 추가 후 다시 채움 (최유진)
+    target = df.index[df["이름"] == "최유진"][1]
+    df.loc[target, "소통"] = np.nan
+    assert assert_matches_original(df) == 1
+    df.loc[target, "소통"] = 2.0
+    assert assert_matches_original(df) == 1
+
+    # 그룹 전체 삭제는 재계산 없이 빠지고, 새 그룹만 계산
+    df = df[df["이름"] != "김민수"]
+    new_rows = pd.DataFrame([["정하늘", 20240009, float(v), 3.0, float(6 - v)] for v in range(1, 5)], columns=COLUMNS)
+    df = pd.concat([df, new_rows], ignore_index=True)
+    assert assert_matches_original(df) == 1
+
+
+def test_removing_all_known_extremes_falls_back_to_rebuild():
+    df = make_sheet()
+    assert_matches_original(df)
+
+    # 가장 작은 값 2개와 가장 큰 값 2개를 한 번에 지움 (요약 통계만으로는 계산 불가)
+    group = df[df["이름"] == "이서연"].sort_values("소통")
+    df = df.drop(list(group.index[:2]) + list(group.index[-2:]))
+    assert assert_matches_original(df) == 1
+
+
+def test_nan_is_trimmed_like_the_original():
+    df = make_sheet()
+    df.loc[df.index[df["이름"] == "박지훈"][:2], "책임감"] = np.nan
+    assert assert_matches_original(df) == 4
+
+    # NaN만 남거나 행이 2개 이하인 그룹도 기존 로직과 같은 결과
+    df.loc[df["이름"] == "최유진", "협업"] = np.nan
+    df = df.drop(df.index[df["이름"] == "김민수"][:3])
+    assert assert_matches_original(df) == 2
+
+
+def test_random_edits_match_original():
+    rng = random.Random(1234)
+    df = make_sheet()
+    assert_matches_original(df)
+
+    for _ in range(200):
+        action = rng.choice(["add", "remove", "edit", "nan"])
+        row = rng.randrange(len(df))
+        if action == "add":
+            name, student_id = df.iloc[row, :2]
+            values = [rng.choice([np.nan, 1.0, 2.0, 3.0, 4.0, 5.0]) for _ in COLUMNS[2:]]
+            df = pd.concat([df, pd.DataFrame([[name, student_id, *values]], columns=COLUMNS)], ignore_index=True)
+        elif action == "remove" and len(df) > 8:
+            df = df.drop(df.index[row]).reset_index(drop=True)
+        elif action == "edit":
+            df.iloc[row, rng.randrange(2, len(COLUMNS))] = float(rng.randint(1, 5))
+        else:
+            df.iloc[row, rng.randrange(2, len(COLUMNS))] = np.nan
+
+        assert_matches_original(df)